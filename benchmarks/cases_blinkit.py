@@ -0,0 +1,83 @@
+"""
+Benchmark cases for 'clustering_products_blinkit'.
+
+Catalogs are generated with 'make_synthetic_catalog' from 'benchmark_segmentation.py', which
+resamples 'data/blinkit_data.csv' and multiplies the item identifiers with the scale.
+"""
+import os
+
+import pandas as pd
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'clustering_products_blinkit')
+DATA_CSV = os.path.join(PROJECT_DIR, 'data', 'blinkit_data.csv')
+
+
+def _catalog(scale):
+    from benchmark_segmentation import make_synthetic_catalog
+    base_df = pd.read_csv(DATA_CSV, encoding='utf-8-sig')
+    return make_synthetic_catalog(base_df, len(base_df) * scale)
+
+
+def _features(scale):
+    from src.segmentation import ITEM_FEATURES, build_item_features, prepare_and_scale_data, \
+        remove_outliers
+    non_outliers_df = remove_outliers(build_item_features(_catalog(scale)))
+    X_scaled, _ = prepare_and_scale_data(non_outliers_df, ITEM_FEATURES)
+    return non_outliers_df, X_scaled
+
+
+def setup_build_item_features(scale):
+    return (_catalog(scale),)
+
+
+def run_build_item_features(df):
+    from src.segmentation import build_item_features
+    return build_item_features(df)
+
+
+def setup_remove_outliers(scale):
+    from src.segmentation import build_item_features
+    return (build_item_features(_catalog(scale)),)
+
+
+def run_remove_outliers(aggregated_df):
+    from src.segmentation import remove_outliers
+    return remove_outliers(aggregated_df)
+
+
+def setup_fit_kmeans(scale):
+    return (_features(scale)[1],)
+
+
+def run_fit_kmeans(X_scaled):
+    from src.segmentation import fit_kmeans
+    return fit_kmeans(X_scaled)
+
+
+def run_sweep_k(X_scaled):
+    from src.segmentation import sweep_k
+    # A single worker keeps the timing comparable between machines and runs.
+    return sweep_k(X_scaled, range(2, 6), n_jobs=1)
+
+
+def setup_assign_segments(scale):
+    from src.assignment import build_artifact
+    from src.segmentation import segment_products
+    non_outliers_df, _ = _features(scale)
+    segments, _, model = segment_products(non_outliers_df)
+    return build_artifact(model, segments), segments
+
+
+def run_assign_segments(artifact, segments):
+    from src.assignment import assign_segments
+    return assign_segments(artifact, segments)
+
+
+CASES = [
+    ('build_item_features', setup_build_item_features, run_build_item_features),
+    ('remove_outliers', setup_remove_outliers, run_remove_outliers),
+    ('fit_kmeans', setup_fit_kmeans, run_fit_kmeans),
+    ('sweep_k', setup_fit_kmeans, run_sweep_k),
+    ('assign_segments', setup_assign_segments, run_assign_segments),
+]
@@ -0,0 +1,162 @@
+"""
+Benchmark cases for 'etl-falabella-playa'.
+
+Synthetic inputs are scaled up from the checked-in CSVs. Network access is replaced by
+offline fakes: product pages are rendered from a local HTML template and the Gemini client
+answers with well-formed batches, so the timings only measure our own parsing and pandas
+code.
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'etl-falabella-playa')
+RAW_CSV = os.path.join(PROJECT_DIR, 'data', 'raw', 'products_details.csv')
+DEDUPLICATED_CSV = os.path.join(PROJECT_DIR, 'data', 'transformed', 'cleaning',
+                                'deduplicated_products.csv')
+
+PRODUCT_PAGE = """
+<html><body>
+<h1 class="jsx-783883818 product-name fa--product-name false">{name}</h1>
+<span class="jsx-3410277752">Código del producto: {code}</span>
+<a id="pdp-product-brand-link">{brand}</a>
+<ol class="Breadcrumbs-module_breadcrumb__3lLwJ">
+  <li><a>Inicio</a></li>
+  <li><a>{category} - {subcategory}</a></li>
+  <li><a>{family}</a></li>
+</ol>
+<img class="jsx-2487856160" src="https://example.com/{code}.jpg"/>
+<ul>
+  <li data-internet-price="{internet_price}"></li>
+  <li data-normal-price="{normal_price}"></li>
+</ul>
+<a id="testId-SellerInfo-sellerName"><span>{seller}</span></a>
+{padding}
+</body></html>
+"""
+
+
+def _scaled_raw(scale):
+    """Repeats the raw scrape 'scale' times, keeping ~30% of the rows as duplicates."""
+    base = pd.read_csv(RAW_CSV, dtype=str)
+    frames = []
+    for i in range(scale):
+        copy = base.copy()
+        if i % 3:
+            copy['url_product'] = copy['url_product'] + f'?copy={i}'
+        frames.append(copy)
+    path = os.path.join(tempfile.mkdtemp(), 'products_details.csv')
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def _chdir_project():
+    # The ETL modules use paths relative to the project root (logs/, src/utils/...).
+    os.chdir(PROJECT_DIR)
+
+
+def setup_clean_prices(scale):
+    _chdir_project()
+    from src.utils.schema import PRODUCT_DETAIL_DTYPES, read_csv_with_schema
+    df = read_csv_with_schema(_scaled_raw(scale), PRODUCT_DETAIL_DTYPES)
+    return (df,)
+
+
+def run_clean_prices(df):
+    from src.transform.transform_scrape_data import clean_prices
+    return clean_prices(df.copy())
+
+
+def setup_handle_duplicates(scale):
+    (df,) = setup_clean_prices(scale)
+    from src.transform.transform_scrape_data import clean_prices
+    output_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(output_dir, 'duplicates'))
+    os.makedirs(os.path.join(output_dir, 'cleaning'))
+    return clean_prices(df), output_dir
+
+
+def run_handle_duplicates(df, output_dir):
+    from src.transform.transform_scrape_data import handle_duplicates
+    return handle_duplicates(df, output_dir)
+
+
+class _FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        return None
+
+
+def setup_get_product_detail(scale):
+    _chdir_project()
+    import src.extract.scraper_falabella as scraper
+    base = pd.read_csv(RAW_CSV, dtype=str).fillna('')
+    rows = base.sample(n=50 * scale, replace=True, random_state=0).to_dict('records')
+    # Pad the page so BeautifulSoup parses a document closer to a real product page.
+    padding = '<div class="filler">' + 'x' * 200 + '</div>\n'
+    pages = {
+        f'https://example.com/p/{i}': PRODUCT_PAGE.format(
+            name=row['name'], code=row['product_code'], brand=row['brand'],
+            category=row['category'], subcategory=row['subcategory'], family=row['family'],
+            internet_price=row['internet_price'], normal_price=row['normal_price'],
+            seller=row['seller'], padding=padding * 200,
+        ).encode('utf-8')
+        for i, row in enumerate(rows)
+    }
+    return scraper, pages
+
+
+def run_get_product_detail(scraper, pages):
+    original_get, original_delay = scraper.requests.get, scraper.DELAY_BETWEEN_REQUESTS
+    scraper.requests.get = lambda url, **kwargs: _FakeResponse(pages[url])
+    scraper.DELAY_BETWEEN_REQUESTS = 0
+    try:
+        return [scraper.get_product_detail(url) for url in pages]
+    finally:
+        scraper.requests.get, scraper.DELAY_BETWEEN_REQUESTS = original_get, original_delay
+
+
+class _FakeModels:
+    """Answers Gemini prompts with one well-formed reply per product in the batch."""
+
+    def generate_content(self, model, contents):
+        if 'Formato de respuesta' in contents:
+            count = contents.count('Formato de respuesta')
+            text = '1. [no]\n2. [Descripción adecuada]\n' * count
+        else:
+            text = 'si\n' * contents.count('Producto:')
+        return type('FakeResponse', (), {'text': text})()
+
+
+class _FakeClient:
+    models = _FakeModels()
+
+
+def setup_enrichment(scale):
+    _chdir_project()
+    os.environ.setdefault('API_GEMINI', 'offline-benchmark')
+    import src.enrichment_ia.enrichment_data as enrichment
+    df = pd.concat([pd.read_csv(DEDUPLICATED_CSV)] * scale, ignore_index=True)
+    return enrichment, df
+
+
+def run_enrichment(enrichment, df):
+    original_client, original_sleep = enrichment.client, enrichment.time.sleep
+    enrichment.client = _FakeClient()
+    enrichment.time.sleep = lambda seconds: None
+    try:
+        return enrichment.enrichment_data_products(df.copy())
+    finally:
+        enrichment.client, enrichment.time.sleep = original_client, original_sleep
+
+
+CASES = [
+    ('clean_prices', setup_clean_prices, run_clean_prices),
+    ('handle_duplicates', setup_handle_duplicates, run_handle_duplicates),
+    ('get_product_detail', setup_get_product_detail, run_get_product_detail),
+    ('enrichment_data_products', setup_enrichment, run_enrichment),
+]
@@ -0,0 +1,63 @@
+"""
+Benchmark cases for 'eda_top_games_google_play'.
+
+'app.load_data' downloads the CSV and runs 'clean_games', so the offline case times
+'clean_games' on 'android-games.csv' repeated with unique titles. The backend cases time
+one full dashboard interaction (price split, both category bars, count and one page of the
+top games).
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'eda_top_games_google_play')
+GAMES_CSV = os.path.join(PROJECT_DIR, 'android-games.csv')
+
+
+def _games(scale):
+    base = pd.read_csv(GAMES_CSV)
+    frames = [base.assign(title=base['title'] + f' #{i}') for i in range(scale)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _interaction(backend):
+    filters = {'category': 'GAME ACTION', 'price': 'Free'}
+    backend.price_counts(**filters)
+    backend.category_totals('total ratings', **filters)
+    backend.category_totals('installs', **filters)
+    backend.count(**filters)
+    return backend.top_games(**filters, limit=10, offset=10)
+
+
+def setup_clean_games(scale):
+    return (_games(scale),)
+
+
+def run_clean_games(data):
+    from backend import clean_games
+    return clean_games(data)
+
+
+def setup_pandas_backend(scale):
+    from backend import PandasBackend, clean_games
+    return (PandasBackend(clean_games(_games(scale))),)
+
+
+def setup_duckdb_backend(scale):
+    from backend import DuckDBBackend, build_parquet
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, 'games.csv')
+    _games(scale).to_csv(csv_path, index=False)
+    return (DuckDBBackend(build_parquet(csv_path, os.path.join(directory, 'games.parquet'))),)
+
+
+# DuckDB allocates outside the Python heap, so tracemalloc cannot see its memory.
+NATIVE_MEMORY_CASES = {'duckdb_backend_interaction'}
+
+CASES = [
+    ('clean_games', setup_clean_games, run_clean_games),
+    ('pandas_backend_interaction', setup_pandas_backend, _interaction),
+    ('duckdb_backend_interaction', setup_duckdb_backend, _interaction),
+]
@@ -0,0 +1,288 @@
+"""
+Performance regression benchmarks for every project in the repository.
+
+Each component ('falabella', 'blinkit', 'games') defines its cases in 'cases_<component>.py'
+as (name, setup, run) tuples. 'setup(scale)' builds synthetic inputs scaled up from the
+checked-in CSVs and 'run(*inputs)' is the measured call. Everything runs offline.
+
+Every component runs in its own subprocess, from its project directory, so the projects'
+'src' packages never clash and peak memory is measured per component. Temporary files
+created by the cases go to a scratch directory that the worker removes when it finishes.
+
+Peak memory is the tracemalloc peak of one call, which only sees Python allocations. Cases
+listed in a module's 'NATIVE_MEMORY_CASES' (e.g. DuckDB queries) are measured as the growth
+of the peak RSS during their first call instead (Linux only; elsewhere their memory is
+recorded as not tracked).
+
+Usage:
+    python benchmarks/run_benchmarks.py run [--components falabella blinkit games]
+                                            [--scales 1 5 25] [--repeat 3]
+    python benchmarks/run_benchmarks.py compare [--baseline -2] [--threshold 0.2]
+                                                [--min-seconds 0.01] [--min-mb 1]
+
+'run' appends the results to 'benchmarks/results/history.json'. 'compare' compares the
+latest run with a baseline run (the previous one by default) and exits with status 1 when
+any case is slower, or uses more peak memory, than the threshold allows.
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+HISTORY_FILE = os.path.join(BENCHMARKS_DIR, 'results', 'history.json')
+
+COMPONENTS = {
+    'falabella': ('cases_falabella', 'etl-falabella-playa'),
+    'blinkit': ('cases_blinkit', 'clustering_products_blinkit'),
+    'games': ('cases_games', 'eda_top_games_google_play'),
+}
+DEFAULT_SCALES = [1, 5, 25]
+
+
+def _status_mb(field):
+    with open('/proc/self/status', encoding='ascii') as f:
+        return int(re.search(rf'{field}:\s+(\d+) kB', f.read()).group(1)) / 1024
+
+
+def _peak_rss_mb(run, inputs):
+    """Growth of the peak RSS during one call, or None when it cannot be measured."""
+    try:
+        # Writing '5' resets VmHWM (the peak RSS) to the current RSS.
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+        baseline = _status_mb('VmRSS')
+    except OSError:
+        return None
+    run(*inputs)
+    return max(0.0, _status_mb('VmHWM') - baseline)
+
+
+def _peak_traced_mb(run, inputs):
+    """tracemalloc peak of one call (Python allocations only)."""
+    tracemalloc.start()
+    try:
+        run(*inputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 ** 2
+
+
+def measure(run, inputs, repeat, native_memory=False):
+    """
+    Parameters:
+    run: Function to measure
+    inputs: Tuple of arguments returned by the case setup
+    repeat: Number of timed calls (the fastest one is kept)
+    native_memory: Measure the peak RSS growth instead of tracemalloc (for native code)
+
+    Returns:
+    Dict with 'seconds' (best of 'repeat'), 'peak_mb' (peak of one call, None when not
+    tracked) and 'memory' (how 'peak_mb' was measured: 'rss', 'tracemalloc' or None)
+    """
+    if native_memory:
+        # Measured on the cold call: after it, native engines serve the data from their own
+        # caches and the RSS barely moves. The call also serves as warm-up for the timings.
+        peak_mb = _peak_rss_mb(run, inputs)
+        memory = 'rss' if peak_mb is not None else None
+    else:
+        # Warm-up call so lazy imports and caches are neither timed nor traced.
+        run(*inputs)
+        peak_mb, memory = _peak_traced_mb(run, inputs), 'tracemalloc'
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(*inputs)
+        timings.append(time.perf_counter() - start)
+    return {'seconds': min(timings), 'peak_mb': peak_mb, 'memory': memory}
+
+
+def run_component(component, scales, repeat):
+    """Runs the cases of one component in the current process (worker side)."""
+    module_name, project = COMPONENTS[component]
+    project_dir = os.path.join(REPO_DIR, project)
+    sys.path.insert(0, project_dir)
+    os.chdir(project_dir)
+    # The ETL logs one line per product; keep the console quiet and the timings stable.
+    logging.disable(logging.INFO)
+
+    module = importlib.import_module(module_name)
+    native_cases = getattr(module, 'NATIVE_MEMORY_CASES', set())
+    results = []
+    with tempfile.TemporaryDirectory(prefix='benchmarks-') as scratch:
+        # Every 'tempfile.mkdtemp()' of the cases lands in the scratch directory.
+        tempfile.tempdir = scratch
+        try:
+            for name, setup, run in module.CASES:
+                for scale in scales:
+                    inputs = setup(scale)
+                    result = measure(run, inputs, repeat, name in native_cases)
+                    result.update({'component': component, 'case': name, 'scale': scale})
+                    results.append(result)
+                    memory = 'n/a' if result['peak_mb'] is None \
+                        else f"{result['peak_mb']:.1f} MB ({result['memory']})"
+                    print(f"{component:<10} {name:<28} x{scale:<5} "
+                          f"{result['seconds']:>10.4f} s {memory:>24}", file=sys.stderr)
+                    del inputs
+        finally:
+            tempfile.tempdir = None
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_history(history, path=HISTORY_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+
+
+def run_benchmarks(components, scales, repeat, history_file=HISTORY_FILE):
+    """
+    Runs every component in a subprocess and appends the run to the JSON history.
+
+    Returns:
+    The run that was appended
+    """
+    results = []
+    for component in components:
+        command = [sys.executable, os.path.abspath(__file__), '_worker', component,
+                   '--repeat', str(repeat), '--scales', *map(str, scales)]
+        output = subprocess.run(command, capture_output=True, text=True, check=False)
+        sys.stderr.write(output.stderr)
+        if output.returncode != 0:
+            raise RuntimeError(f'Benchmarks for {component} failed')
+        results.extend(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'results': results,
+    }
+    history = load_history(history_file)
+    history.append(run)
+    save_history(history, history_file)
+    return run
+
+
+def compare_runs(baseline, current, threshold, memory_threshold, min_seconds, min_mb):
+    """
+    Parameters:
+    baseline: Run used as reference
+    current: Run being checked
+    threshold: Allowed relative slowdown (0.2 = 20%)
+    memory_threshold: Allowed relative growth of peak memory
+    min_seconds: Timings below this value are treated as noise and never flagged
+    min_mb: Peak memory below this value is treated as noise and never flagged
+
+    Returns:
+    List of rows (dicts) with the ratios ('memory_ratio' is None when memory is not
+    comparable) and a 'regression' flag
+    """
+    reference = {(r['component'], r['case'], r['scale']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        key = (result['component'], result['case'], result['scale'])
+        if key not in reference:
+            continue
+        old = reference[key]
+        time_ratio = result['seconds'] / old['seconds'] if old['seconds'] else 1.0
+        slower = time_ratio > 1 + threshold and result['seconds'] >= min_seconds
+        # Memory is only compared when both runs measured it the same way.
+        tracked = result.get('peak_mb') is not None and old.get('peak_mb') is not None \
+            and result.get('memory', 'tracemalloc') == old.get('memory', 'tracemalloc')
+        memory_ratio = result['peak_mb'] / old['peak_mb'] if tracked and old['peak_mb'] \
+            else None
+        bigger = memory_ratio is not None and memory_ratio > 1 + memory_threshold \
+            and result['peak_mb'] >= min_mb
+        rows.append({
+            'component': key[0], 'case': key[1], 'scale': key[2],
+            'time_ratio': time_ratio, 'memory_ratio': memory_ratio,
+            'regression': slower or bigger,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performance regression benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks and store the results')
+    run_parser.add_argument('--components', nargs='+', choices=list(COMPONENTS),
+                            default=list(COMPONENTS))
+    run_parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--history', default=HISTORY_FILE)
+
+    compare_parser = subparsers.add_parser('compare', help='Flag regressions between runs')
+    compare_parser.add_argument('--baseline', type=int, default=-2,
+                                help='Index of the baseline run in the history')
+    compare_parser.add_argument('--current', type=int, default=-1,
+                                help='Index of the run to check in the history')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+    compare_parser.add_argument('--memory-threshold', type=float, default=0.2)
+    compare_parser.add_argument('--min-seconds', type=float, default=0.01)
+    compare_parser.add_argument('--min-mb', type=float, default=1.0)
+    compare_parser.add_argument('--history', default=HISTORY_FILE)
+
+    worker_parser = subparsers.add_parser('_worker')
+    worker_parser.add_argument('component', choices=list(COMPONENTS))
+    worker_parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    worker_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+    if args.command == '_worker':
+        print(json.dumps(run_component(args.component, args.scales, args.repeat)))
+        return 0
+
+    if args.command == 'run':
+        run = run_benchmarks(args.components, args.scales, args.repeat, args.history)
+        print(f"Stored {len(run['results'])} results in {args.history}")
+        return 0
+
+    history = load_history(args.history)
+    if len(history) < 2:
+        print('At least two runs are needed to compare.')
+        return 0
+    rows = compare_runs(history[args.baseline], history[args.current], args.threshold,
+                        args.memory_threshold, args.min_seconds, args.min_mb)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else 'ok'
+        memory = 'n/a' if row['memory_ratio'] is None else f"x{row['memory_ratio']:.2f}"
+        print(f"{row['component']:<10} {row['case']:<28} x{row['scale']:<5} "
+              f"time x{row['time_ratio']:.2f}  memory {memory:<6} {flag}")
+    regressions = sum(row['regression'] for row in rows)
+    print(f'{regressions} regression(s) found.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Scaling benchmark for 'src/segmentation.py'.
+
+Builds synthetic catalogs from 'data/blinkit_data.csv' (rows are resampled and item
+identifiers are multiplied so the number of items grows with the number of rows) and
+times every stage of the segmentation, from 8.5k up to 10M sales rows.
+
+Usage:
+    python benchmark_segmentation.py
+    python benchmark_segmentation.py --sizes 8523 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.segmentation import (ITEM_FEATURES, build_item_features, fit_kmeans,
+                              prepare_and_scale_data, remove_outliers, sweep_k)
+
+DATA_PATH = 'data/blinkit_data.csv'
+DEFAULT_SIZES = [8_523, 100_000, 1_000_000, 10_000_000]
+
+
+def make_synthetic_catalog(base_df, n_rows, random_state=42):
+    """
+    Parameters:
+    base_df: Original 'blinkit_data' DataFrame
+    n_rows: Number of sales rows to generate
+
+    Returns:
+    DataFrame with the columns used by the segmentation
+    """
+    rng = np.random.default_rng(random_state)
+    idx = rng.integers(0, len(base_df), n_rows)
+    copies = max(1, n_rows // len(base_df))
+    suffix = rng.integers(0, copies, n_rows).astype(str)
+    return pd.DataFrame({
+        'Item_Identifier': base_df['Item_Identifier'].to_numpy()[idx] + '-' + suffix,
+        'Item_Visibility': base_df['Item_Visibility'].to_numpy()[idx],
+        'Item_MRP': base_df['Item_MRP'].to_numpy()[idx],
+        'Item_Outlet_Sales': base_df['Item_Outlet_Sales'].to_numpy()[idx]
+                             * rng.lognormal(0, 0.1, n_rows),
+    })
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(sizes, cluster_range=range(2, 11)):
+    """
+    Parameters:
+    sizes: Number of sales rows of each synthetic catalog
+    cluster_range: Candidate k values for the sweep
+
+    Returns:
+    DataFrame with the seconds spent on every stage per size
+    """
+    base_df = pd.read_csv(DATA_PATH, encoding='utf-8-sig')
+    rows = []
+    for n_rows in sizes:
+        df = make_synthetic_catalog(base_df, n_rows)
+        aggregated_df, t_features = timed(build_item_features, df)
+        non_outliers_df, t_outliers = timed(remove_outliers, aggregated_df)
+        X_scaled, _ = prepare_and_scale_data(non_outliers_df, ITEM_FEATURES)
+        _, t_fit = timed(fit_kmeans, X_scaled)
+        _, t_sweep = timed(sweep_k, X_scaled, cluster_range)
+        rows.append({
+            'rows': n_rows,
+            'items': len(aggregated_df),
+            'build_item_features_s': t_features,
+            'remove_outliers_s': t_outliers,
+            'fit_kmeans_s': t_fit,
+            'sweep_k_s': t_sweep,
+        })
+        print(pd.DataFrame(rows[-1:]).round(3).to_string(index=False))
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Blinkit segmentation scaling benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    args = parser.parse_args()
+    results = run_benchmark(args.sizes)
+    print()
+    print(results.round(3).to_string(index=False))
@@ -0,0 +1,276 @@
+"""
+Incremental segment assignment for the Blinkit catalog.
+
+Stores the fitted 'StandardScaler' and centroids from 'src/segmentation.py' as a small
+'.npz' artifact, so new or updated items can be scored against the saved clusters without
+refitting:
+
+1. Artifact: scaler mean/scale, centroids, feature names and reference statistics of the
+   training data (mean distance to the closest centroid and cluster proportions).
+2. Assignment: scales the item features and picks the closest centroid with plain numpy
+   broadcasting, in vectorized batches.
+3. Drift: compares a batch of items with the reference statistics and flags when a full
+   refit with 'analyze_store_data' is needed. Batches smaller than 'MIN_DRIFT_ITEMS' are
+   reported but never trigger a refit: their statistics are too noisy.
+4. Alignment: after a refit the new clusters are renumbered to match the closest old
+   centroids, so labels assigned before the refit keep their meaning.
+
+Usage:
+    from src.assignment import build_artifact, save_artifact, load_artifact, assign_items
+    save_artifact(build_artifact(results['model'], results['product_segments']), path)
+    segments = assign_items(load_artifact(path), new_sales_df)
+
+    segments, artifact, report = update_segments(artifact, batch_df,
+                                                 refit=lambda: fit_artifact(catalog_df))
+    if report['refitted']:
+        save_artifact(artifact, path)
+"""
+import os
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.segmentation import ITEM_FEATURES, N_CLUSTERS, analyze_store_data, build_item_features
+
+ARTIFACT_PATH = os.path.join('models', 'segmentation.npz')
+
+# Thresholds used by 'needs_refit'.
+MAX_MEAN_SHIFT = 0.5        # |mean| of a scaled feature, in training standard deviations
+MAX_STD_RATIO = 1.5         # std of a scaled feature (training std is 1)
+MAX_DISTANCE_RATIO = 1.5    # mean distance to closest centroid vs. training
+MAX_CLUSTER_PSI = 0.2       # population stability index of the cluster proportions
+# Below this many items a batch drawn from the training catalog already exceeds the
+# thresholds by chance (~80% of 5-item and ~20% of 20-item batches; none from 100 items).
+MIN_DRIFT_ITEMS = 100
+
+
+def _closest_centroid(X_scaled, centroids):
+    distances = ((X_scaled[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+    labels = distances.argmin(axis=1)
+    return labels, np.sqrt(distances[np.arange(len(labels)), labels])
+
+
+def build_artifact(model, training_df, features_numeric=None):
+    """
+    Parameters:
+    model: Dict with the fitted 'scaler' and 'kmeans' returned by 'segment_products'
+    training_df: Aggregated DataFrame the model was fitted on
+    features_numeric: List of numerical columns used by the model
+
+    Returns:
+    artifact: Dict of numpy arrays ready for 'save_artifact'
+    """
+    features_numeric = features_numeric or ITEM_FEATURES
+    scaler, kmeans = model['scaler'], model['kmeans']
+    centroids = np.asarray(kmeans.cluster_centers_, dtype=np.float64)
+
+    X_scaled = scaler.transform(training_df[features_numeric].to_numpy(dtype=np.float64))
+    labels, distances = _closest_centroid(X_scaled, centroids)
+    proportions = np.bincount(labels, minlength=len(centroids)) / len(labels)
+
+    return {
+        'features': np.asarray(features_numeric),
+        'mean': np.asarray(scaler.mean_, dtype=np.float64),
+        'scale': np.asarray(scaler.scale_, dtype=np.float64),
+        'centroids': centroids,
+        'reference_distance': np.float64(distances.mean()),
+        'reference_proportions': proportions,
+        'n_training_items': np.int64(len(training_df)),
+    }
+
+
+def fit_artifact(sales_df, n_clusters=N_CLUSTERS):
+    """
+    Full refit: runs 'analyze_store_data' and packs the result as an artifact.
+
+    Parameters:
+    sales_df: Raw sales rows of the whole catalog
+    n_clusters: Number of clusters
+
+    Returns:
+    artifact: Dict of numpy arrays ready for 'save_artifact'
+    """
+    results = analyze_store_data(sales_df, n_clusters=n_clusters)
+    return build_artifact(results['model'], results['product_segments'])
+
+
+def save_artifact(artifact, path=ARTIFACT_PATH):
+    """
+    Parameters:
+    artifact: Dict returned by 'build_artifact'
+    path: Destination '.npz' file
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez(path, **artifact)
+
+
+def load_artifact(path=ARTIFACT_PATH):
+    """
+    Parameters:
+    path: '.npz' file written by 'save_artifact'
+
+    Returns:
+    artifact: Dict of numpy arrays
+    """
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def assign_segments(artifact, features_df, batch_size=100_000):
+    """
+    Scores already aggregated items against the saved centroids.
+
+    Parameters:
+    artifact: Dict returned by 'build_artifact' or 'load_artifact'
+    features_df: DataFrame with the model features (one row per item)
+    batch_size: Items scored per vectorized batch
+
+    Returns:
+    labels: Cluster of every item
+    distances: Euclidean distance (scaled space) to the assigned centroid
+    """
+    X = features_df[list(artifact['features'])].to_numpy(dtype=np.float64)
+    labels = np.empty(len(X), dtype=np.int64)
+    distances = np.empty(len(X), dtype=np.float64)
+    for start in range(0, len(X), batch_size):
+        X_scaled = (X[start:start + batch_size] - artifact['mean']) / artifact['scale']
+        end = start + len(X_scaled)
+        labels[start:end], distances[start:end] = _closest_centroid(X_scaled,
+                                                                    artifact['centroids'])
+    return labels, distances
+
+
+def assign_items(artifact, sales_df):
+    """
+    Builds the item features from raw sales rows and assigns each item to a segment.
+
+    'sales_df' must contain every sales row of the items being scored, otherwise their
+    totals are partial and the assignment (and drift statistics) are biased.
+
+    Parameters:
+    artifact: Dict returned by 'build_artifact' or 'load_artifact'
+    sales_df: Raw sales rows of the new or updated items
+
+    Returns:
+    DataFrame with the item features plus 'Cluster' and 'Distance'
+    """
+    aggregated_df = build_item_features(sales_df)
+    aggregated_df['Cluster'], aggregated_df['Distance'] = assign_segments(artifact,
+                                                                          aggregated_df)
+    return aggregated_df
+
+
+def drift_report(artifact, features_df):
+    """
+    Compares a batch of items with the data the artifact was fitted on.
+
+    Parameters:
+    artifact: Dict returned by 'build_artifact' or 'load_artifact'
+    features_df: DataFrame with the model features (one row per item)
+
+    Returns:
+    Dict with 'mean_shift' and 'std_ratio' per feature, 'distance_ratio', 'cluster_psi'
+    and 'n_items'
+    """
+    features = [str(feature) for feature in artifact['features']]
+    X_scaled = (features_df[features].to_numpy(dtype=np.float64) - artifact['mean']) \
+        / artifact['scale']
+    labels, distances = _closest_centroid(X_scaled, artifact['centroids'])
+
+    reference = np.clip(artifact['reference_proportions'], 1e-6, None)
+    current = np.bincount(labels, minlength=len(reference)) / len(labels)
+    current = np.clip(current, 1e-6, None)
+
+    return {
+        'mean_shift': dict(zip(features, np.abs(X_scaled.mean(axis=0)))),
+        'std_ratio': dict(zip(features, X_scaled.std(axis=0))),
+        'distance_ratio': float(distances.mean() / artifact['reference_distance']),
+        'cluster_psi': float(((current - reference) * np.log(current / reference)).sum()),
+        'n_items': len(features_df),
+    }
+
+
+def needs_refit(report):
+    """
+    Parameters:
+    report: Dict returned by 'drift_report'
+
+    Returns:
+    True when the batch has at least 'MIN_DRIFT_ITEMS' items and any drift statistic
+    exceeds its threshold
+    """
+    if report['n_items'] < MIN_DRIFT_ITEMS:
+        return False
+    return (
+        max(report['mean_shift'].values()) > MAX_MEAN_SHIFT
+        or max(report['std_ratio'].values()) > MAX_STD_RATIO
+        or report['distance_ratio'] > MAX_DISTANCE_RATIO
+        or report['cluster_psi'] > MAX_CLUSTER_PSI
+    )
+
+
+def align_artifact(artifact, reference):
+    """
+    Renumbers the clusters of a refitted artifact after the closest clusters of the
+    previous one, so a label keeps meaning the same segment across refits.
+
+    Centroids are compared in the original feature units and matched one to one with the
+    Hungarian algorithm; when the new model has more clusters, the extra ones keep the
+    highest labels.
+
+    Parameters:
+    artifact: New artifact (e.g. returned by 'fit_artifact')
+    reference: Artifact used before the refit
+
+    Returns:
+    artifact: Copy of 'artifact' with 'centroids' and 'reference_proportions' reordered
+    """
+    new_centroids = artifact['centroids'] * artifact['scale'] + artifact['mean']
+    old_centroids = reference['centroids'] * reference['scale'] + reference['mean']
+    # Distances measured in the new scaled space, so no feature dominates by its units.
+    cost = ((((old_centroids - artifact['mean']) / artifact['scale'])[:, None, :]
+             - artifact['centroids'][None, :, :]) ** 2).sum(axis=2)
+    old_labels, new_labels = linear_sum_assignment(cost)
+    order = new_labels[np.argsort(old_labels)]
+    order = np.concatenate([order, np.setdiff1d(np.arange(len(new_centroids)), order)])
+
+    aligned = dict(artifact)
+    aligned['centroids'] = artifact['centroids'][order]
+    aligned['reference_proportions'] = artifact['reference_proportions'][order]
+    return aligned
+
+
+def update_segments(artifact, sales_df, refit=None):
+    """
+    Assigns new items and runs a full refit only when the batch has drifted.
+
+    The batch is only used to detect drift, and only when it has at least
+    'MIN_DRIFT_ITEMS' items (see 'needs_refit'). 'refit' takes no arguments and must fit on
+    the sales rows of the whole catalog (see 'fit_artifact'), never on the batch alone, e.g.:
+
+        refit = lambda: fit_artifact(load_table(engine))    # load_table from src.extract
+
+    The refitted artifact is aligned with 'align_artifact' and returned but not written; the
+    caller must persist it with 'save_artifact' so later batches are scored against it.
+
+    Parameters:
+    artifact: Dict returned by 'build_artifact' or 'load_artifact'
+    sales_df: Raw sales rows of the new or updated items
+    refit: Callable without arguments returning an artifact fitted on the whole catalog
+           (optional; without it drift is only reported)
+
+    Returns:
+    segments: DataFrame returned by 'assign_items' (with the new artifact when refitted)
+    artifact: Artifact used for the assignment
+    report: Drift report of the batch, with 'refitted' set to True when 'refit' ran
+    """
+    segments = assign_items(artifact, sales_df)
+    report = drift_report(artifact, segments)
+    report['refitted'] = False
+    if refit is not None and needs_refit(report):
+        artifact = align_artifact(refit(), artifact)
+        segments = assign_items(artifact, sales_df)
+        report['refitted'] = True
+    return segments, artifact, report
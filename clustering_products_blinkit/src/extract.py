@@ -0,0 +1,227 @@
+"""
+SQL extraction layer for the 'blinkit_data' source.
+
+Replaces the one-shot 'pd.read_sql(text("SELECT * FROM blinkit_data"), connection)' of
+'blinkit.ipynb' with:
+
+1. Column projection: only the columns the segmentation uses are selected.
+2. Streaming reads: rows are fetched in chunks through a server-side cursor
+   ('stream_results=True' + 'chunksize').
+3. Aggregation push-down: the per-item aggregates are computed by the database with
+   'GROUP BY Item_Identifier', so only one row per item crosses the network.
+4. Snapshot cache: results are stored as Parquet under 'data/cache/', keyed on the table
+   watermark (row count plus MAX of a watermark column, or plus the sums of the numeric
+   columns when there is none) and the requested columns.
+
+Queries are built with SQLAlchemy constructs, so the same code runs on SQL Server and on a
+local SQLite copy of the table.
+
+Usage:
+    from src.extract import get_engine, load_item_features
+    engine = get_engine()
+    aggregated_df = load_item_features(engine)
+"""
+import hashlib
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import column, create_engine, func, select, table
+
+from src.segmentation import RAW_COLUMNS, units_sold
+
+SERVER = 'DATGUILLE'
+DATABASE = 'blinkitdb'
+CONNECTION_STRING = (
+    f'mssql+pyodbc://{SERVER}/{DATABASE}?driver=ODBC+Driver+18+for+SQL+Server'
+    '&Trusted_Connection=yes&TrustServerCertificate=yes'
+)
+TABLE_NAME = 'blinkit_data'
+CACHE_DIR = os.path.join('data', 'cache')
+CHUNKSIZE = 50_000
+# Columns summed by 'get_watermark' when no watermark column is given.
+CHECKSUM_COLUMNS = ['Item_Visibility', 'Item_MRP', 'Item_Outlet_Sales']
+CHECKSUM_DECIMALS = 4
+
+
+def get_engine(connection_string=CONNECTION_STRING):
+    """
+    Parameters:
+    connection_string: SQLAlchemy URL (SQL Server by default, e.g. 'sqlite:///blinkit.db')
+
+    Returns:
+    engine: SQLAlchemy Engine
+    """
+    return create_engine(connection_string)
+
+
+def get_watermark(engine, table_name=TABLE_NAME, watermark_column=None):
+    """
+    Without a watermark column the row count alone would miss UPDATEs that keep the number
+    of rows (e.g. intraday sales corrections), so the sums of 'CHECKSUM_COLUMNS' are added
+    as a change signal. They are computed by the database in the same scan as the count.
+    A monotonic watermark column (rowversion, load timestamp) is still preferred: it also
+    catches edits that happen to keep the sums.
+
+    Parameters:
+    engine: SQLAlchemy Engine
+    table_name: Source table
+    watermark_column: Monotonic column (e.g. a load timestamp); the row count plus the
+                      checksum sums are used when None
+
+    Returns:
+    Watermark value as a string
+    """
+    source = table(table_name)
+    if watermark_column is None:
+        # Rounded so the float sums do not change with the aggregation order of the server.
+        signals = [func.round(func.sum(column(name)), CHECKSUM_DECIMALS)
+                   for name in CHECKSUM_COLUMNS]
+    else:
+        signals = [func.max(column(watermark_column))]
+    query = select(func.count(), *signals).select_from(source)
+    with engine.connect() as connection:
+        return '-'.join(str(value) for value in connection.execute(query).one())
+
+
+def read_table_chunks(engine, table_name=TABLE_NAME, columns=None, chunksize=CHUNKSIZE):
+    """
+    Streams the table in chunks, fetching only the requested columns.
+
+    Parameters:
+    engine: SQLAlchemy Engine
+    table_name: Source table
+    columns: Columns to select (default: the ones used by the segmentation)
+    chunksize: Rows per chunk
+
+    Yields:
+    DataFrame chunks
+    """
+    columns = columns or RAW_COLUMNS
+    query = select(*[column(name) for name in columns]).select_from(table(table_name))
+    with engine.connect().execution_options(stream_results=True) as connection:
+        yield from pd.read_sql(query, connection, chunksize=chunksize)
+
+
+def aggregate_items_sql(engine, table_name=TABLE_NAME):
+    """
+    Computes the per-item features in the database ('GROUP BY Item_Identifier').
+
+    Parameters:
+    engine: SQLAlchemy Engine
+    table_name: Source table
+
+    Returns:
+    aggregated_df: Same columns as 'build_item_features'
+    """
+    item = column('Item_Identifier')
+    query = (
+        select(
+            item,
+            func.avg(column('Item_Visibility')).label('Item_Visibility'),
+            func.avg(column('Item_MRP')).label('Item_MRP'),
+            func.sum(column('Item_Outlet_Sales')).label('Total_Sale'),
+        )
+        .select_from(table(table_name))
+        .group_by(item)
+        .order_by(item)
+    )
+    with engine.connect() as connection:
+        aggregated_df = pd.read_sql(query, connection)
+    aggregated_df['Units_Sold'] = units_sold(aggregated_df['Total_Sale'],
+                                             aggregated_df['Item_MRP'])
+    return aggregated_df
+
+
+def _cache_path(cache_dir, table_name, kind, watermark, columns):
+    key = hashlib.sha1(f'{watermark}|{",".join(columns)}'.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f'{table_name}_{kind}_{key}.parquet')
+
+
+def _remove_old_snapshots(path, table_name, kind):
+    """Deletes the other snapshots of the same table and kind once 'path' is in place."""
+    cache_dir = os.path.dirname(path)
+    pattern = re.compile(rf'{re.escape(table_name)}_{kind}_[0-9a-f]{{16}}\.parquet')
+    for file_name in os.listdir(cache_dir):
+        old_path = os.path.join(cache_dir, file_name)
+        if pattern.fullmatch(file_name) and old_path != path:
+            os.remove(old_path)
+
+
+def load_table(engine, table_name=TABLE_NAME, columns=None, chunksize=CHUNKSIZE,
+               cache_dir=CACHE_DIR, watermark_column=None):
+    """
+    Returns the projected table, reading it from the Parquet snapshot when the table
+    watermark has not changed.
+
+    On a cache miss the chunks are written to Parquet as they arrive, so the full table is
+    never held twice in memory. Once the new snapshot is complete, the older snapshots of
+    the table are deleted; if the read fails, the partial file is removed.
+
+    Parameters:
+    engine: SQLAlchemy Engine
+    table_name: Source table
+    columns: Columns to select (default: the ones used by the segmentation)
+    chunksize: Rows per chunk
+    cache_dir: Directory of the Parquet snapshots
+    watermark_column: See 'get_watermark'
+
+    Returns:
+    DataFrame with the requested columns
+    """
+    columns = columns or RAW_COLUMNS
+    watermark = get_watermark(engine, table_name, watermark_column)
+    path = _cache_path(cache_dir, table_name, 'rows', watermark, columns)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        writer = None
+        completed = False
+        try:
+            for chunk in read_table_chunks(engine, table_name, columns, chunksize):
+                batch = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, batch.schema)
+                writer.write_table(batch.cast(writer.schema))
+            completed = True
+        finally:
+            if writer is not None:
+                writer.close()
+            if not completed and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if writer is None:
+            return pd.DataFrame(columns=columns)
+        os.replace(tmp_path, path)
+        _remove_old_snapshots(path, table_name, 'rows')
+    return pd.read_parquet(path)
+
+
+def load_item_features(engine, table_name=TABLE_NAME, cache_dir=CACHE_DIR,
+                       watermark_column=None):
+    """
+    Returns the per-item features computed in SQL, cached on the table watermark.
+
+    Older item snapshots of the table are deleted once the new one is written.
+
+    Parameters:
+    engine: SQLAlchemy Engine
+    table_name: Source table
+    cache_dir: Directory of the Parquet snapshots
+    watermark_column: See 'get_watermark'
+
+    Returns:
+    aggregated_df: Same columns as 'build_item_features'
+    """
+    watermark = get_watermark(engine, table_name, watermark_column)
+    path = _cache_path(cache_dir, table_name, 'items', watermark, RAW_COLUMNS)
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    aggregated_df = aggregate_items_sql(engine, table_name)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    aggregated_df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    _remove_old_snapshots(path, table_name, 'items')
+    return aggregated_df
@@ -0,0 +1,202 @@
+"""
+Product segmentation for the Blinkit catalog.
+
+Packaged version of the clustering in 'blinkit.ipynb' so it can run as a nightly job on
+catalogs much larger than 'data/blinkit_data.csv':
+
+1. Feature build: aggregates every 'Item_Identifier' (mean visibility, mean MRP, total
+   sales and units sold), exactly as the notebook does.
+2. Outlier removal: drops items outside 1.5 * IQR of 'Item_Visibility' or 'Total_Sale'
+   with one boolean mask.
+3. Clustering: 'StandardScaler' + 'MiniBatchKMeans'.
+4. k-sweep: fits candidate k values in parallel and scores each one with the silhouette
+   computed on a sample.
+
+Usage:
+    from src.segmentation import analyze_store_data
+    results = analyze_store_data(raw_df)
+"""
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+ITEM_FEATURES = ['Item_Visibility', 'Total_Sale', 'Units_Sold']
+OUTLIER_FEATURES = ['Item_Visibility', 'Total_Sale']
+RAW_COLUMNS = ['Item_Identifier', 'Item_Visibility', 'Item_MRP', 'Item_Outlet_Sales']
+
+N_CLUSTERS = 3
+RANDOM_STATE = 42
+BATCH_SIZE = 4096
+SILHOUETTE_SAMPLE = 10_000
+# Decimals kept before flooring 'Units_Sold' (see 'units_sold').
+UNITS_DECIMALS = 9
+
+
+def units_sold(total_sale, item_mrp):
+    """
+    Parameters:
+    total_sale: Total sales per item
+    item_mrp: Mean MRP per item
+
+    Returns:
+    floor(total_sale / item_mrp), rounded first to 'UNITS_DECIMALS' decimals so exact
+    multiples do not flip to the lower integer depending on the summation order (pandas and
+    the database sum in different orders)
+    """
+    return np.floor(np.round(total_sale / item_mrp, UNITS_DECIMALS))
+
+
+def build_item_features(df):
+    """
+    Parameters:
+    df: DataFrame with at least 'Item_Identifier', 'Item_Visibility', 'Item_MRP'
+        and 'Item_Outlet_Sales'
+
+    Returns:
+    aggregated_df: One row per item with 'Item_Visibility' (mean), 'Item_MRP' (mean),
+                   'Total_Sale' (sum) and 'Units_Sold'
+    """
+    aggregated_df = df.groupby('Item_Identifier', as_index=False).agg({
+        'Item_Visibility': 'mean',
+        'Item_MRP': 'mean',
+        'Item_Outlet_Sales': 'sum',
+    })
+    aggregated_df = aggregated_df.rename(columns={'Item_Outlet_Sales': 'Total_Sale'})
+    aggregated_df['Units_Sold'] = units_sold(aggregated_df['Total_Sale'],
+                                             aggregated_df['Item_MRP'])
+    return aggregated_df
+
+
+def remove_outliers(df, columns=None, factor=1.5):
+    """
+    Parameters:
+    df: Aggregated DataFrame
+    columns: Columns checked with the IQR rule (default: visibility and total sale)
+    factor: IQR multiplier
+
+    Returns:
+    non_outliers_df: Rows not outside [Q1 - factor * IQR, Q3 + factor * IQR] in any column
+                     (rows with missing values are kept, as in the notebook)
+    """
+    columns = columns or OUTLIER_FEATURES
+    values = df[columns].to_numpy(dtype=np.float64)
+    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    outside = (values < q1 - factor * iqr) | (values > q3 + factor * iqr)
+    return df[~outside.any(axis=1)]
+
+
+def prepare_and_scale_data(df, features_numeric, scaler=None):
+    """
+    Parameters:
+    df: DataFrame
+    features_numeric: List of numerical columns
+    scaler: Already fitted StandardScaler (a new one is fitted when None)
+
+    Returns:
+    X_scaled: Scaled numerical data
+    scaler: StandardScaler used for the transformation
+    """
+    X_numeric = df[features_numeric].to_numpy(dtype=np.float64)
+    if scaler is None:
+        scaler = StandardScaler().fit(X_numeric)
+    return scaler.transform(X_numeric), scaler
+
+
+def fit_kmeans(X_scaled, n_clusters=N_CLUSTERS, random_state=RANDOM_STATE,
+               batch_size=BATCH_SIZE):
+    """
+    Parameters:
+    X_scaled: Scaled feature matrix
+    n_clusters: Number of clusters
+
+    Returns:
+    kmeans: Fitted MiniBatchKMeans
+    """
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                             batch_size=batch_size, n_init=3)
+    return kmeans.fit(X_scaled)
+
+
+def _evaluate_k(X_scaled, n_clusters, sample_size, random_state):
+    kmeans = fit_kmeans(X_scaled, n_clusters=n_clusters, random_state=random_state)
+    labels = kmeans.predict(X_scaled)
+    sample_size = min(sample_size, len(X_scaled))
+    score = silhouette_score(X_scaled, labels, sample_size=sample_size,
+                             random_state=random_state)
+    return {'k': n_clusters, 'inertia': kmeans.inertia_, 'silhouette': score}
+
+
+def sweep_k(X_scaled, cluster_range=range(2, 11), sample_size=SILHOUETTE_SAMPLE,
+            n_jobs=-1, random_state=RANDOM_STATE):
+    """
+    Elbow and silhouette evaluation for several cluster counts, run in parallel.
+
+    Parameters:
+    X_scaled: Scaled feature matrix
+    cluster_range: Candidate k values
+    sample_size: Rows used to compute each silhouette score
+    n_jobs: Parallel workers (joblib)
+
+    Returns:
+    DataFrame with 'k', 'inertia' and 'silhouette' per candidate
+    """
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_k)(X_scaled, k, sample_size, random_state) for k in cluster_range
+    )
+    return pd.DataFrame(results)
+
+
+def segment_products(df, n_clusters=N_CLUSTERS, features_numeric=None):
+    """
+    Parameters:
+    df: Aggregated DataFrame without outliers
+    n_clusters: Number of clusters
+
+    Returns:
+    df: Input DataFrame with the 'Cluster' column
+    cluster_stats: Sum of the features per cluster
+    model: Dict with the fitted 'scaler' and 'kmeans'
+    """
+    features_numeric = features_numeric or ITEM_FEATURES
+    X_scaled, scaler = prepare_and_scale_data(df, features_numeric)
+    kmeans = fit_kmeans(X_scaled, n_clusters=n_clusters)
+
+    df = df.copy()
+    df['Cluster'] = kmeans.predict(X_scaled)
+    cluster_stats = df.groupby('Cluster').agg({
+        'Item_Visibility': 'sum',
+        'Units_Sold': 'sum',
+        'Total_Sale': 'sum'
+    }).round(2)
+    return df, cluster_stats, {'scaler': scaler, 'kmeans': kmeans}
+
+
+def analyze_store_data(df, n_clusters=N_CLUSTERS, cluster_range=None):
+    """
+    Runs the full segmentation from raw sales rows.
+
+    Parameters:
+    df: Raw DataFrame with the 'blinkit_data' columns
+    n_clusters: Number of clusters of the final model
+    cluster_range: Candidate k values for the sweep (skipped when None)
+
+    Returns:
+    Dict with 'product_segments', 'product_stats', 'model' and, when requested, 'k_sweep'
+    """
+    aggregated_df = build_item_features(df)
+    non_outliers_df = remove_outliers(aggregated_df)
+    product_segments, product_stats, model = segment_products(non_outliers_df, n_clusters)
+
+    results = {
+        'product_segments': product_segments,
+        'product_stats': product_stats,
+        'model': model,
+    }
+    if cluster_range is not None:
+        X_scaled, _ = prepare_and_scale_data(non_outliers_df, ITEM_FEATURES, model['scaler'])
+        results['k_sweep'] = sweep_k(X_scaled, cluster_range)
+    return results
@@ -1,9 +1,10 @@
+import os
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import numpy as np
+from backend import DuckDBBackend, PandasBackend, clean_games
 
 # Page Settings
 st.set_page_config(page_title="Google Play Games Analysis", layout="wide")
@@ -25,25 +26,28 @@ def load_data():
     url = "https://raw.githubusercontent.com/anthoguille/data_analysis/refs/heads/main/eda_top_games_google_play/android-games.csv"
     data = pd.read_csv(url)
     # Data Cleaning
-    data[['installs', 'mult']] = data['installs'].str.split(expand=True)
-    pd.set_option('future.no_silent_downcasting', True)
-    data['mult'] = data['mult'].replace({'M': 1, 'K': 0.1, 'k': 0.1})
-    data['installs'] = data['installs'].astype(float) * data['mult']
-    data['price'] = data['price'].apply(lambda x: 'Free' if x == 0 else 'Paid')
-    return data
+    return clean_games(data)
 
-data = load_data()
+# Query backend: 'pandas' (default) keeps the table in memory, 'duckdb' pushes every
+# query down to a Parquet file built with `python backend.py <csv> <parquet>`.
+@st.cache_resource  # One backend per server process
+def load_backend(backend_name, parquet_path):
+    if backend_name == 'duckdb':
+        return DuckDBBackend(parquet_path)
+    return PandasBackend(load_data())
+
+backend = load_backend(os.getenv('GAMES_BACKEND', 'pandas'), os.getenv('GAMES_PARQUET', 'games.parquet'))
 
 # Sidebar for filters
 st.sidebar.title("Filters")
-category_filter = st.sidebar.selectbox("Select a category", ['All'] + list(data['category'].unique()))
+category_filter = st.sidebar.selectbox("Select a category", ['All'] + backend.categories())
 price_filter = st.sidebar.selectbox("Select price type", ['All', 'Free', 'Paid'])
 
-# Filters applying
-if category_filter != 'All':
-    data = data[data['category'] == category_filter]
-if price_filter != 'All':
-    data = data[data['price'] == price_filter]
+# Filters applying ('All' means no filter)
+filters = {
+    'category': None if category_filter == 'All' else category_filter,
+    'price': None if price_filter == 'All' else price_filter,
+}
 
 # Answers to key questions
 st.header("Answers to Key Questions")
@@ -52,8 +56,9 @@ st.header("Answers to Key Questions")
 # Container for the first question
 with st.container():
     st.subheader("1. Percentage of Free Games")
-    free_games = data[data['price'] == 'Free'].shape[0]
-    paid_games = data[data['price'] == 'Paid'].shape[0]
+    price_counts = backend.price_counts(**filters)
+    free_games = price_counts['Free']
+    paid_games = price_counts['Paid']
     total_games = free_games + paid_games
     free_percentage = (free_games / total_games) * 100
 
@@ -74,8 +79,7 @@ with st.container():
 # Container for the second question
 with st.container():
     st.subheader("2. Category with the Most Total Ratings")
-    category_ratings = data.groupby('category')['total ratings'].sum().reset_index()
-    category_ratings = category_ratings.sort_values('total ratings', ascending=False)
+    category_ratings = backend.category_totals('total ratings', **filters)
 
     fig2 = px.bar(category_ratings, x='category', y='total ratings', color='category',
                   labels={'total ratings': 'Total Ratings', 'category': 'Category'})
@@ -90,8 +94,7 @@ with st.container():
 # Container for the third question
 with st.container():
     st.subheader("3. Most Installed Category")
-    category_installs = data.groupby('category')['installs'].sum().reset_index()
-    category_installs = category_installs.sort_values('installs', ascending=False)
+    category_installs = backend.category_totals('installs', **filters)
 
     fig3 = px.bar(category_installs, x='category', y='installs', color='category',
                   labels={'installs': 'Installs (Millions)', 'category': 'Category'})
@@ -113,18 +116,12 @@ with st.container():
     - **Installs** (installs).
     """)
 
-    # Calculate the weighted score
-    # Ensure that 'total ratings' and 'installs' are numeric and handle NaN values
-    data['total ratings'] = pd.to_numeric(data['total ratings'], errors='coerce')
-    data['installs'] = pd.to_numeric(data['installs'], errors='coerce')
-    data['total ratings'] = data['total ratings'].fillna(0)
-    data['installs'] = data['installs'].fillna(0)
-
-    data['score'] = data['average rating'] * np.log(data['total ratings'] + 1) * np.log(data['installs'] + 1)
-
-    # Get the top 10 games
-    top_games = data.sort_values(by='score', ascending=False).head(10)
-    top_games = top_games[['title', 'category', 'average rating', 'total ratings', 'installs', 'price']]
+    # The weighted score is computed by the backend ('score' column)
+    # Server-side pagination: only one page of 10 games is fetched
+    page_size = 10
+    total_pages = max(1, -(-backend.count(**filters) // page_size))
+    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+    top_games = backend.top_games(**filters, limit=page_size, offset=(page - 1) * page_size)
 
     fig4 = go.Figure(data=[go.Table(
         header=dict(values=list(top_games.columns),
@@ -134,7 +131,7 @@ with st.container():
                            top_games['total ratings'], top_games['installs'], top_games['price']],
                    align='left'))
     ])
-    fig4.update_layout(title_text="Top 10 Games According to Google Play", title_x=0.5)
+    fig4.update_layout(title_text=f"Top Games According to Google Play (page {page} of {total_pages})", title_x=0.5)
     st.plotly_chart(fig4, use_container_width=True)
 
 # Explanation of the formula
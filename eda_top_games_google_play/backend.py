@@ -0,0 +1,190 @@
+"""
+Query backends for the Google Play games dashboard.
+
+Every chart in 'app.py' is answered by a small query, so the dashboard can switch
+between:
+
+* PandasBackend: the original in-memory DataFrame, fine for 'android-games.csv'.
+* DuckDBBackend: filters, group-bys and top-N scoring pushed down to DuckDB over a
+  Parquet file, so only the small result sets reach Streamlit (and the browser).
+
+Build the Parquet file once with:
+    python backend.py android-games.csv games.parquet
+
+and run the dashboard with:
+    GAMES_BACKEND=duckdb GAMES_PARQUET=games.parquet streamlit run app.py
+"""
+import sys
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+TOP_COLUMNS = ['title', 'category', 'average rating', 'total ratings', 'installs', 'price']
+
+# Same cleaning and score as the original app, expressed in SQL for the Parquet build.
+CLEAN_SQL = """
+    SELECT
+        title,
+        category,
+        "average rating",
+        coalesce(TRY_CAST("total ratings" AS DOUBLE), 0) AS "total ratings",
+        coalesce(TRY_CAST(split_part(installs, ' ', 1) AS DOUBLE)
+                 * CASE split_part(installs, ' ', 2)
+                       WHEN 'M' THEN 1 WHEN 'K' THEN 0.1 WHEN 'k' THEN 0.1 END, 0)
+            AS installs,
+        CASE WHEN price = 0 THEN 'Free' ELSE 'Paid' END AS price
+    FROM read_csv_auto(?)
+"""
+
+
+def clean_games(data):
+    """Cleans the raw games table (installs in millions and Free/Paid price)."""
+    data = data.copy()
+    data[['installs', 'mult']] = data['installs'].str.split(expand=True)
+    with pd.option_context('future.no_silent_downcasting', True):
+        data['mult'] = data['mult'].replace({'M': 1, 'K': 0.1, 'k': 0.1})
+    data['installs'] = data['installs'].astype(float) * data['mult'].astype(float)
+    data['price'] = data['price'].apply(lambda x: 'Free' if x == 0 else 'Paid')
+    return data
+
+
+def add_score(data):
+    """Weighted score: average rating * log(total ratings + 1) * log(installs + 1)."""
+    data['total ratings'] = pd.to_numeric(data['total ratings'], errors='coerce').fillna(0)
+    data['installs'] = pd.to_numeric(data['installs'], errors='coerce').fillna(0)
+    data['score'] = data['average rating'] * np.log(data['total ratings'] + 1) \
+        * np.log(data['installs'] + 1)
+    return data
+
+
+def _sql_string(value):
+    """Quotes a value as a SQL string literal (for statements that take no parameters)."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def build_parquet(csv_path, parquet_path):
+    """Cleans the CSV, precomputes the score and writes it as Parquet sorted by score."""
+    with duckdb.connect() as con:
+        con.execute(f"""
+            COPY (
+                SELECT *, "average rating" * ln("total ratings" + 1) * ln(installs + 1) AS score
+                FROM ({CLEAN_SQL})
+                ORDER BY score DESC, title
+            ) TO {_sql_string(parquet_path)} (FORMAT PARQUET)
+        """, [csv_path])
+    return parquet_path
+
+
+class PandasBackend:
+    """Answers the dashboard queries with boolean masks over an in-memory DataFrame."""
+
+    def __init__(self, data):
+        self.data = add_score(data.copy())
+
+    def _filter(self, category=None, price=None):
+        data = self.data
+        if category is not None:
+            data = data[data['category'] == category]
+        if price is not None:
+            data = data[data['price'] == price]
+        return data
+
+    def categories(self):
+        return list(self.data['category'].unique())
+
+    def price_counts(self, category=None, price=None):
+        counts = self._filter(category, price)['price'].value_counts()
+        return {label: int(counts.get(label, 0)) for label in ('Free', 'Paid')}
+
+    def category_totals(self, column, category=None, price=None):
+        totals = self._filter(category, price).groupby('category')[column].sum().reset_index()
+        return totals.sort_values([column, 'category'], ascending=[False, True])
+
+    def count(self, category=None, price=None):
+        return len(self._filter(category, price))
+
+    def top_games(self, category=None, price=None, limit=10, offset=0):
+        top = self._filter(category, price).sort_values(by=['score', 'title'],
+                                                        ascending=[False, True])
+        return top[TOP_COLUMNS].iloc[offset:offset + limit]
+
+
+class DuckDBBackend:
+    """
+    Answers the dashboard queries with SQL over a Parquet file built by 'build_parquet'.
+
+    'games' is a view over the Parquet file, so the rows stay on disk. At startup only a
+    rollup table with one row per (category, price) is built; counts and per-category totals
+    are read from it. The file is already sorted by score, so top-N pages scan it only until
+    the page is filled.
+    """
+
+    def __init__(self, parquet_path):
+        self.con = duckdb.connect()
+        self.con.execute(f"""
+            CREATE VIEW games AS SELECT * FROM read_parquet({_sql_string(parquet_path)})
+        """)
+        self.con.execute("""
+            CREATE TABLE games_rollup AS
+            SELECT category, price, count(*) AS n,
+                   sum("total ratings") AS "total ratings", sum(installs) AS installs
+            FROM games
+            GROUP BY category, price
+        """)
+
+    def _query(self, sql, params=()):
+        # A cursor per query keeps the shared connection safe across Streamlit threads.
+        return self.con.cursor().execute(sql, list(params)).df()
+
+    @staticmethod
+    def _where(category=None, price=None):
+        clauses, params = [], []
+        if category is not None:
+            clauses.append('category = ?')
+            params.append(category)
+        if price is not None:
+            clauses.append('price = ?')
+            params.append(price)
+        return ('WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def categories(self):
+        return self._query("SELECT DISTINCT category FROM games_rollup ORDER BY category")[
+            'category'].tolist()
+
+    def price_counts(self, category=None, price=None):
+        where, params = self._where(category, price)
+        counts = self._query(f"""
+            SELECT price, sum(n) AS n FROM games_rollup {where} GROUP BY price
+        """, params)
+        counts = dict(zip(counts['price'], counts['n']))
+        return {label: int(counts.get(label, 0)) for label in ('Free', 'Paid')}
+
+    def category_totals(self, column, category=None, price=None):
+        where, params = self._where(category, price)
+        return self._query(f"""
+            SELECT category, sum("{column}") AS "{column}"
+            FROM games_rollup {where}
+            GROUP BY category
+            ORDER BY "{column}" DESC, category
+        """, params)
+
+    def count(self, category=None, price=None):
+        where, params = self._where(category, price)
+        return int(self._query(f"SELECT coalesce(sum(n), 0) AS n FROM games_rollup {where}",
+                               params)['n'][0])
+
+    def top_games(self, category=None, price=None, limit=10, offset=0):
+        where, params = self._where(category, price)
+        columns = ', '.join(f'"{col}"' for col in TOP_COLUMNS)
+        # No ORDER BY on purpose: the Parquet file is written by score and DuckDB keeps the
+        # file order, so the scan stops as soon as the requested page is complete.
+        return self._query(f"""
+            SELECT {columns}
+            FROM games {where}
+            LIMIT ? OFFSET ?
+        """, params + [limit, offset])
+
+
+if __name__ == '__main__':
+    print(build_parquet(sys.argv[1], sys.argv[2]))
@@ -4,7 +4,9 @@ Este módulo contiene el pipeline ETL para procesar datos de ventas.
 from src.extract.scraper_falabella import main as scraper_sf
 from src.transform.transform_scrape_data import transform_scrape_data
 from src.load.load_csv import load_data_csv
+from src.load.load_history import append_price_history, get_price_changes
 from src.enrichment_ia.enrichment_data import enrichment_data_products
+from src.analysis.analysis_products import run_analysis
 from src.utils.logger import logger
 def ejecutar_pipeline_etl():
     """
@@ -20,6 +22,12 @@ def ejecutar_pipeline_etl():
             # 2. Transformación
             logger.info("Fase de Transformación...")
             transform_data = transform_scrape_data(raw_file_path)
+            # 2.1 Histórico de precios
+            logger.info("Registrando histórico de precios...")
+            price_changes = get_price_changes(transform_data)
+            logger.info("Productos con cambio de precio desde la última ejecución: %s",
+                        len(price_changes))
+            append_price_history(transform_data)
             # 3. Enriquecimiento con IA
             logger.info("Enriquecimiento de datos con IA...")
             df_enrichment = enrichment_data_products(transform_data)
@@ -27,6 +35,9 @@ def ejecutar_pipeline_etl():
             logger.info("Fase de Carga...")
             csv_output_path = "data/transformed/enrichment/enrichment_products.csv"
             load_data_csv(df_enrichment, csv_output_path)
+            # 5. Análisis
+            logger.info("Fase de Análisis...")
+            run_analysis()
             logger.info("Pipeline ETL completado con éxito. Guardados en: %s", csv_output_path)
         else:
             logger.info("Error: El archivo falló al generarse. Revisa el scraper.")
@@ -0,0 +1,239 @@
+"""
+Este módulo calcula las agregaciones del análisis de productos como etapa final del pipeline.
+
+Reproduce las agrupaciones de 'notebooks/data_analysis.ipynb' y 'notebooks/data_cleaning.ipynb':
+
+- Productos sin relación con su familia ('relation_batch' falso) por familia.
+- Productos duplicados por familia.
+- Productos duplicados por nombre/URL/precio.
+- Reviews promedio por familia.
+- Rating ponderado (metodología IMDb) promedio por familia.
+
+Las agregaciones se materializan como tablas en una base DuckDB local
+('data/output/analysis/analysis.duckdb'). Junto a ellas se guarda la huella (hash SHA-256
+del contenido) de cada CSV de entrada y, por agregación, la huella de la fuente con la que se
+generó. Así, en cada ejecución solo se recalculan y regeneran los reportes (.md y .png) cuyas
+entradas cambiaron de contenido, aunque el pipeline haya reescrito el archivo.
+
+La huella de una agregación se guarda después de escribir su tabla y su reporte: si una
+agregación falla, la siguiente ejecución la vuelve a generar.
+"""
+import hashlib
+import os
+
+import duckdb
+from matplotlib.figure import Figure
+from src.utils.logger import logger
+
+DATABASE_PATH = os.path.join("data", "output", "analysis", "analysis.duckdb")
+REPORTS_DIR = os.path.join("data", "output", "analysis", "aggregates")
+VISUALIZATION_DIR = os.path.join("data", "output", "visualization", "aggregates")
+
+SOURCES = {
+    "enrichment": os.path.join("data", "transformed", "enrichment", "enrichment_products.csv"),
+    "duplicates": os.path.join("data", "transformed", "duplicates", "duplicated_products.csv"),
+}
+
+# Mínimo de reviews 'm' del rating ponderado (IMDb).
+MIN_REVIEWS = 5
+
+AGGREGATES = {
+    "unrelated_products_family": {
+        "title": "Productos sin relación con su familia",
+        "source": "enrichment",
+        "query": """
+            SELECT family, count(name) AS total_products
+            FROM enrichment
+            WHERE relation_batch = false
+            GROUP BY family
+            ORDER BY total_products DESC, family
+        """,
+        "plot": ("family", "total_products"),
+    },
+    "duplicated_products_family": {
+        "title": "Duplicados por familia de productos",
+        "source": "duplicates",
+        "query": """
+            SELECT family, count(family) AS count_products
+            FROM duplicates
+            GROUP BY family
+            ORDER BY count_products DESC, family
+        """,
+        "plot": ("family", "count_products"),
+    },
+    "duplicated_products_name": {
+        "title": "Duplicados por producto",
+        "source": "duplicates",
+        "query": """
+            SELECT url_product, name, normal_price, internet_price,
+                   count(name) AS count, first("price_diff_%") AS diff
+            FROM duplicates
+            GROUP BY url_product, name, normal_price, internet_price
+            ORDER BY count DESC, name
+        """,
+        "plot": None,
+    },
+    "reviews_mean_family": {
+        "title": "Reviews promedio por familia",
+        "source": "enrichment",
+        "query": """
+            SELECT family, avg(reviews) AS mean_reviews, count(name) AS count_products
+            FROM enrichment
+            GROUP BY family
+            ORDER BY mean_reviews DESC, family
+        """,
+        "plot": ("family", "mean_reviews"),
+    },
+    "mean_weighted_rating": {
+        "title": "Rating ponderado promedio por familia",
+        "source": "enrichment",
+        "query": f"""
+            WITH global AS (SELECT avg(rating) AS c FROM enrichment)
+            SELECT family,
+                   avg(reviews / (reviews + {MIN_REVIEWS}) * rating
+                       + {MIN_REVIEWS} / (reviews + {MIN_REVIEWS}) * global.c)
+                       AS mean_weighted_rating,
+                   count(name) AS count_products
+            FROM enrichment, global
+            GROUP BY family
+            ORDER BY mean_weighted_rating DESC, family
+        """,
+        "plot": ("family", "mean_weighted_rating"),
+    },
+}
+
+
+def _fingerprint(path, block_size=1024 * 1024):
+    """Huella del archivo: hash SHA-256 de su contenido."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stored_fingerprints(con, table):
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (name VARCHAR PRIMARY KEY, fingerprint VARCHAR)
+    """)
+    return dict(con.execute(f"SELECT name, fingerprint FROM {table}").fetchall())
+
+
+def _refresh_sources(con, sources):
+    """
+    Recarga en DuckDB las fuentes cuyo contenido cambió.
+
+    Returns:
+        dict: Huella actual de cada fuente disponible.
+    """
+    stored = _stored_fingerprints(con, "_sources")
+    fingerprints = {}
+    for name, path in sources.items():
+        if not os.path.exists(path):
+            logger.warning("Fuente del análisis no encontrada: %s", path)
+            continue
+        fingerprint = _fingerprint(path)
+        fingerprints[name] = fingerprint
+        if stored.get(name) == fingerprint and _table_exists(con, name):
+            continue
+        logger.info("Cargando fuente del análisis '%s' desde %s", name, path)
+        con.execute(f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM read_csv_auto(?)", [path])
+        con.execute("INSERT OR REPLACE INTO _sources VALUES (?, ?)", [name, fingerprint])
+    return fingerprints
+
+
+def _table_exists(con, table):
+    query = "SELECT count(*) FROM information_schema.tables WHERE table_name = ?"
+    return con.execute(query, [table]).fetchone()[0] > 0
+
+
+def _to_markdown(title, df):
+    """Convierte el DataFrame en una tabla Markdown sin depender de 'tabulate'."""
+    header = "| " + " | ".join(df.columns) + " |"
+    separator = "| " + " | ".join("---" for _ in df.columns) + " |"
+    rows = [
+        "| " + " | ".join(f"{value:.2f}" if isinstance(value, float) else str(value)
+                          for value in row) + " |"
+        for row in df.itertuples(index=False)
+    ]
+    return "\n".join([f"## {title}", "", header, separator, *rows, ""])
+
+
+def _write_report(name, aggregate, df, reports_dir, visualization_dir):
+    """Genera el reporte Markdown y, si corresponde, el gráfico de barras de la agregación."""
+    os.makedirs(reports_dir, exist_ok=True)
+    report_path = os.path.join(reports_dir, f"{name}.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(_to_markdown(aggregate["title"], df))
+
+    if aggregate["plot"] and not df.empty:
+        os.makedirs(visualization_dir, exist_ok=True)
+        label, value = aggregate["plot"]
+        fig = Figure(figsize=(8, max(3, 0.3 * len(df))))
+        ax = fig.subplots()
+        ax.barh(df[label], df[value], color="lightcoral")
+        ax.invert_yaxis()
+        ax.set_xlabel(value, fontsize=12, fontweight="bold")
+        ax.set_ylabel(label, fontsize=12, fontweight="bold")
+        ax.set_title(aggregate["title"], fontsize=14, fontweight="bold")
+        fig.tight_layout()
+        fig.savefig(os.path.join(visualization_dir, f"{name}.png"))
+    logger.info("Reporte generado: %s", report_path)
+
+
+def run_analysis(database_path=DATABASE_PATH, sources=None, reports_dir=REPORTS_DIR,
+                 visualization_dir=VISUALIZATION_DIR):
+    """
+    Actualiza las agregaciones materializadas y regenera los reportes afectados.
+
+    Una agregación se recalcula si el contenido de su fuente cambió desde la última vez
+    que se generó correctamente o si su tabla todavía no existe.
+
+    Args:
+        database_path (str, opcional): Ruta de la base DuckDB con las tablas materializadas.
+        sources (dict, opcional): Mapeo nombre de fuente -> ruta del CSV.
+        reports_dir (str, opcional): Directorio de los reportes Markdown.
+        visualization_dir (str, opcional): Directorio de los gráficos PNG.
+
+    Returns:
+        list: Nombres de las agregaciones regeneradas.
+    """
+    sources = sources or SOURCES
+    os.makedirs(os.path.dirname(database_path), exist_ok=True)
+    regenerated = []
+    with duckdb.connect(database_path) as con:
+        fingerprints = _refresh_sources(con, sources)
+        generated = _stored_fingerprints(con, "_aggregates")
+        for name, aggregate in AGGREGATES.items():
+            fingerprint = fingerprints.get(aggregate["source"])
+            if fingerprint is None:
+                continue
+            table = f"agg_{name}"
+            if generated.get(name) == fingerprint and _table_exists(con, table):
+                logger.info("Agregación '%s' sin cambios, se reutiliza", name)
+                continue
+            con.execute(f"CREATE OR REPLACE TABLE {table} AS {aggregate['query']}")
+            df = con.execute(f"SELECT * FROM {table}").df()
+            _write_report(name, aggregate, df, reports_dir, visualization_dir)
+            # Se registra al final: si algo falla antes, se regenera en la próxima ejecución.
+            con.execute("INSERT OR REPLACE INTO _aggregates VALUES (?, ?)", [name, fingerprint])
+            regenerated.append(name)
+    logger.info("Análisis completado: %s reportes regenerados", len(regenerated))
+    return regenerated
+
+
+def read_aggregate(name, database_path=DATABASE_PATH):
+    """
+    Lee una agregación materializada.
+
+    Args:
+        name (str): Nombre de la agregación (clave de AGGREGATES).
+        database_path (str, opcional): Ruta de la base DuckDB.
+
+    Returns:
+        pandas.DataFrame: Tabla materializada.
+    """
+    if name not in AGGREGATES:
+        raise ValueError(f"Agregación desconocida: {name}")
+    with duckdb.connect(database_path, read_only=True) as con:
+        return con.execute(f"SELECT * FROM agg_{name}").df()
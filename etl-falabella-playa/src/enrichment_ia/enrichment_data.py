@@ -17,9 +17,11 @@ Crea tres nuevas columnas: 'relation_batch', 'clarity_flag_batch' y 'suggested_d
 import os
 import time
 import re
+import pandas as pd
 from dotenv import load_dotenv
 from google import genai #type: ignore
 from src.utils.logger import logger
+from src.utils.schema import ENRICHMENT_DTYPES
 
 
 load_dotenv()
@@ -151,9 +153,8 @@ def enrichment_data_products(df):
         pandas.DataFrame: DataFrame enriquecido.
     """
     batch_size = 30
-    df['relation_batch'] = None
-    df['clarity_flag_batch'] = None
-    df['suggested_description_batch'] = None
+    for col in ['relation_batch', 'clarity_flag_batch', 'suggested_description_batch']:
+        df[col] = pd.Series(pd.NA, index=df.index, dtype=ENRICHMENT_DTYPES[col])
 
     total_batches = (len(df) + batch_size - 1) // batch_size
 
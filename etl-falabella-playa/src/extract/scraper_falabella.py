@@ -48,6 +48,7 @@ from selenium.common.exceptions import (
 from bs4 import BeautifulSoup, Tag
 import pandas as pd
 from src.utils.logger import logger
+from src.utils.schema import PRODUCTS_LIST_DTYPES, read_csv_with_schema
 
 BASE_URL = "https://www.falabella.com.pe/falabella-pe/collection/lo-mejor-de-playa"
 PAGES_TO_SCRAPE = 12
@@ -320,7 +321,7 @@ def main():
 
     # 2. Scrapear detalles de cada producto
     logger.info("Obteniendo detalles de los productos...")
-    products_df = pd.read_csv(PRODUCTS_LIST_FILE)
+    products_df = read_csv_with_schema(PRODUCTS_LIST_FILE, PRODUCTS_LIST_DTYPES)
     all_product_details: List[ProductDetail] = []
 
     for _, row in products_df.iterrows():
@@ -0,0 +1,247 @@
+"""
+Este módulo mantiene un histórico de precios de solo anexado (append-only), particionado
+por fecha de ejecución del pipeline.
+
+Cada ejecución escribe un archivo Parquet nuevo dentro de 'data/history/prices/run_date=AAAA-MM-DD/'
+sin modificar las observaciones anteriores, de modo que se conserva la evolución de
+'internet_price', 'normal_price' y 'price_diff_%' de cada producto.
+
+Junto a las particiones se guarda un índice ('_index.parquet') con una fila por producto
+('product_code', 'url_product') que contiene su última observación y el rango de fechas en el
+que aparece. El índice permite:
+
+- Búsquedas puntuales de un producto leyendo solo las particiones donde existe.
+- Consultas de cambios respecto a la última ejecución sin recorrer todo el histórico.
+- Compactar las particiones con varios archivos en uno solo.
+"""
+import os
+import uuid
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from src.utils.logger import logger
+
+HISTORY_DIR = os.path.join("data", "history", "prices")
+INDEX_FILE_NAME = "_index.parquet"
+KEY_COLUMNS = ["product_code", "url_product"]
+PRICE_COLUMNS = ["internet_price", "normal_price", "price_diff_%"]
+HISTORY_COLUMNS = KEY_COLUMNS + ["name", "family"] + PRICE_COLUMNS
+# Los precios se comparan al céntimo para no marcar cambios por ruido de punto flotante.
+PRICE_DECIMALS = 2
+
+
+def _index_path(history_dir):
+    return os.path.join(history_dir, INDEX_FILE_NAME)
+
+
+def _partition_path(history_dir, run_date):
+    return os.path.join(history_dir, f"run_date={run_date}")
+
+
+def _write_parquet_atomic(df, path):
+    """Escribe el Parquet en un archivo temporal y lo renombra para no dejar archivos a medias."""
+    directory, file_name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{file_name}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _prepare_snapshot(df):
+    """
+    Selecciona las columnas del histórico y normaliza las claves.
+
+    'product_code' se guarda como texto para que las búsquedas no dependan de cómo
+    pandas infirió el tipo al leer el CSV.
+    """
+    snapshot = df[HISTORY_COLUMNS].copy()
+    snapshot["product_code"] = snapshot["product_code"].astype("string")
+    snapshot["url_product"] = snapshot["url_product"].astype("string")
+    snapshot[PRICE_COLUMNS] = snapshot[PRICE_COLUMNS].astype("float64")
+    return snapshot.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+
+
+def read_price_index(history_dir=HISTORY_DIR):
+    """
+    Lee el índice de productos del histórico.
+
+    Args:
+        history_dir (str, opcional): Directorio raíz del histórico.
+
+    Returns:
+        pandas.DataFrame: Una fila por producto con su última observación de precios,
+                          'first_run_date' y 'last_run_date'. Vacío si no hay histórico.
+    """
+    index_path = _index_path(history_dir)
+    if not os.path.exists(index_path):
+        columns = HISTORY_COLUMNS + ["first_run_date", "last_run_date", "run_ts"]
+        return pd.DataFrame(columns=columns)
+    return pd.read_parquet(index_path)
+
+
+def get_price_changes(df, history_dir=HISTORY_DIR):
+    """
+    Obtiene los productos cuyo precio cambió respecto a la última ejecución registrada.
+
+    Un producto se considera cambiado si no existe en el índice o si alguno de
+    'internet_price', 'normal_price' o 'price_diff_%' difiere de su última observación
+    al redondear a 'PRICE_DECIMALS' decimales.
+
+    Args:
+        df (pandas.DataFrame): DataFrame transformado de la ejecución actual.
+        history_dir (str, opcional): Directorio raíz del histórico.
+
+    Returns:
+        pandas.DataFrame: Filas de 'df' (sin duplicados por producto) que son nuevas o
+                          cambiaron de precio.
+    """
+    snapshot = _prepare_snapshot(df)
+    index = read_price_index(history_dir)
+    if index.empty:
+        return snapshot
+
+    previous = index[KEY_COLUMNS + PRICE_COLUMNS].astype({key: "string" for key in KEY_COLUMNS})
+    merged = snapshot.merge(previous, on=KEY_COLUMNS, how="left",
+                            suffixes=("", "_prev"), indicator=True)
+    changed = merged["_merge"] == "left_only"
+    for col in PRICE_COLUMNS:
+        current = merged[col].round(PRICE_DECIMALS)
+        prev = merged[f"{col}_prev"].astype("float64").round(PRICE_DECIMALS)
+        both_null = current.isna() & prev.isna()
+        differs = current != prev
+        changed |= ~both_null & (differs | current.isna() | prev.isna())
+
+    result = merged.loc[changed.to_numpy(), snapshot.columns]
+    logger.info("%s de %s productos nuevos o con cambio de precio", len(result), len(snapshot))
+    return result.reset_index(drop=True)
+
+
+def append_price_history(df, run_date=None, history_dir=HISTORY_DIR):
+    """
+    Anexa las observaciones de precios de la ejecución actual al histórico.
+
+    Nunca reescribe particiones existentes: cada llamada crea un archivo nuevo dentro de
+    la partición de 'run_date' y actualiza el índice de productos.
+
+    Args:
+        df (pandas.DataFrame): DataFrame transformado de la ejecución actual.
+        run_date (str, opcional): Fecha de la ejecución (AAAA-MM-DD). Por defecto, hoy.
+        history_dir (str, opcional): Directorio raíz del histórico.
+
+    Returns:
+        str: Ruta del archivo Parquet escrito.
+    """
+    run_date = run_date or date.today().isoformat()
+    run_ts = datetime.now()
+    snapshot = _prepare_snapshot(df)
+    snapshot["run_ts"] = run_ts
+
+    partition = _partition_path(history_dir, run_date)
+    os.makedirs(partition, exist_ok=True)
+    file_path = os.path.join(partition, f"part-{run_ts:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+    logger.info("Anexando %s observaciones de precios al histórico: %s", len(snapshot), file_path)
+    _write_parquet_atomic(snapshot, file_path)
+
+    _update_index(snapshot, run_date, history_dir)
+    return file_path
+
+
+def _update_index(snapshot, run_date, history_dir):
+    """Combina el snapshot con el índice conservando la última observación de cada producto."""
+    index = read_price_index(history_dir)
+    current = snapshot.assign(first_run_date=run_date, last_run_date=run_date)
+    if index.empty:
+        updated = current
+    else:
+        index = index.astype({key: "string" for key in KEY_COLUMNS})
+        first_seen = index[KEY_COLUMNS + ["first_run_date"]]
+        current = current.drop(columns="first_run_date").merge(first_seen, on=KEY_COLUMNS,
+                                                               how="left")
+        current["first_run_date"] = current["first_run_date"].fillna(run_date)
+        updated = pd.concat([index, current[index.columns]], ignore_index=True)
+        updated = updated.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+
+    updated = updated.sort_values(KEY_COLUMNS).reset_index(drop=True)
+    _write_parquet_atomic(updated, _index_path(history_dir))
+    logger.info("Índice del histórico actualizado: %s productos", len(updated))
+
+
+def lookup_price_history(product_code=None, url_product=None, history_dir=HISTORY_DIR):
+    """
+    Devuelve todas las observaciones de precios de un producto.
+
+    Usa el índice para leer solo las particiones comprendidas entre la primera y la
+    última fecha en que se vio el producto.
+
+    Args:
+        product_code (str, opcional): Código del producto.
+        url_product (str, opcional): URL del producto.
+        history_dir (str, opcional): Directorio raíz del histórico.
+
+    Returns:
+        pandas.DataFrame: Observaciones ordenadas por 'run_ts'. Vacío si no existe.
+    """
+    if product_code is None and url_product is None:
+        raise ValueError("Debe indicar 'product_code' o 'url_product'")
+
+    index = read_price_index(history_dir)
+    mask = pd.Series(True, index=index.index)
+    if product_code is not None:
+        mask &= index["product_code"].astype("string") == str(product_code)
+    if url_product is not None:
+        mask &= index["url_product"].astype("string") == url_product
+    matches = index[mask]
+    if matches.empty:
+        return pd.DataFrame(columns=HISTORY_COLUMNS + ["run_ts", "run_date"])
+
+    first_run, last_run = matches["first_run_date"].min(), matches["last_run_date"].max()
+    run_filter = (ds.field("run_date") >= first_run) & (ds.field("run_date") <= last_run)
+    key_filter = ds.field("url_product").isin(matches["url_product"].tolist())
+    partitioning = ds.partitioning(pa.schema([("run_date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(history_dir, format="parquet", partitioning=partitioning,
+                         exclude_invalid_files=True, ignore_prefixes=["_", "."])
+    history = dataset.to_table(filter=run_filter & key_filter).to_pandas()
+    return history.sort_values("run_ts").reset_index(drop=True)
+
+
+def compact_price_history(history_dir=HISTORY_DIR, before=None):
+    """
+    Compacta las particiones del histórico que tienen más de un archivo.
+
+    Los archivos de una misma fecha se combinan en uno solo, quedándose con la última
+    observación de cada producto en esa fecha. Las fechas nunca se mezclan entre sí, por lo
+    que la evolución diaria de precios se conserva.
+
+    Args:
+        history_dir (str, opcional): Directorio raíz del histórico.
+        before (str, opcional): Solo compacta particiones anteriores a esta fecha (AAAA-MM-DD).
+
+    Returns:
+        int: Número de particiones compactadas.
+    """
+    if not os.path.isdir(history_dir):
+        return 0
+
+    compacted = 0
+    for entry in sorted(os.listdir(history_dir)):
+        if not entry.startswith("run_date="):
+            continue
+        run_date = entry.split("=", 1)[1]
+        if before is not None and run_date >= before:
+            continue
+        partition = os.path.join(history_dir, entry)
+        files = sorted(f for f in os.listdir(partition) if f.endswith(".parquet"))
+        if len(files) <= 1:
+            continue
+
+        frames = [pd.read_parquet(os.path.join(partition, f)) for f in files]
+        merged = pd.concat(frames, ignore_index=True).sort_values("run_ts")
+        merged = merged.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+        _write_parquet_atomic(merged, os.path.join(partition, "part-compacted.parquet"))
+        for f in files:
+            if f != "part-compacted.parquet":
+                os.remove(os.path.join(partition, f))
+        logger.info("Partición %s compactada: %s archivos -> 1", run_date, len(files))
+        compacted += 1
+    return compacted
@@ -17,6 +17,8 @@ Los datos limpios y las filas duplicadas se guardan en el directorio 'data/trans
 """
 import pandas as pd
 from src.utils.logger import logger  # Importa el logger desde utils
+from src.utils.schema import PRODUCT_DETAIL_DTYPES, TRANSFORMED_DTYPES, apply_schema, \
+    read_csv_with_schema
 
 def clean_prices(df):
     """
@@ -42,15 +44,11 @@ def clean_prices(df):
     df['normal_price'] =df['normal_price'].fillna(df['internet_price'])
 
     logger.info("Convirtiendo a decimales los valores de %s y %s", columns[2], columns[3])
-    df[['normal_price', 'internet_price']] = df[['normal_price', 'internet_price']]\
-    .apply(lambda row: pd.Series({col: float(row[col].replace(',', ''))
-                                  if isinstance(row[col], str)
-                                  else row[col] for col in row.index}),
-                                axis=1
-           )
+    for col in columns[2:]:
+        df[col] = pd.to_numeric(df[col].astype("string").str.replace(',', '', regex=False))
     logger.info("Agregando columna calculada 'price_diff_%'")
     df['price_diff_%'] = (df['normal_price'] - df['internet_price'])/df['normal_price'] *100
-    return df
+    return apply_schema(df, TRANSFORMED_DTYPES)
 
 def handle_duplicates(df, transformed_path="data/transformed"):
     """
@@ -87,7 +85,7 @@ def transform_scrape_data(raw_file_path):
         pandas.DataFrame: DataFrame con datos de ventas transformados.
     """
     logger.info("Iniciando transformaciones de datos scrapeados...")
-    df = pd.read_csv(raw_file_path).copy()
+    df = read_csv_with_schema(raw_file_path, PRODUCT_DETAIL_DTYPES)
     df_cleaning_prices = clean_prices(df)
     df_cleaned = handle_duplicates(df_cleaning_prices)
     logger.info("Transformaciones de datos escrapeados completado.")
@@ -0,0 +1,140 @@
+"""
+Este módulo declara los tipos de datos de las columnas del proyecto ETL.
+
+Los esquemas siguen los campos de 'ProductDetail' (ver 'src/extract/scraper_falabella.py')
+y se aplican al leer los CSV para evitar columnas 'object':
+
+- Textos de baja cardinalidad ('brand', 'category', 'subcategory', 'family', 'seller') como
+  categóricos.
+- Textos libres (nombre, URLs, códigos) como strings de Arrow.
+- 'reviews' y 'rating' con el menor ancho que admite sus valores.
+- Precios como float64 una vez limpiados (float32 pierde precisión en montos).
+- Banderas de enriquecimiento como booleanos nullables y categóricos.
+
+Nota: al agrupar por columnas categóricas usar 'observed=True' para no generar grupos vacíos.
+
+Ejecutar este módulo (python -m src.utils.schema) imprime un reporte de memoria y latencia
+de agrupación sobre los datos escalados del CSV de productos.
+"""
+import time
+
+import pandas as pd
+
+ARROW_STRING = "string[pyarrow]"
+
+CATEGORY_COLUMNS = ["brand", "category", "subcategory", "family", "seller"]
+PRICE_COLUMNS = ["cmr_price", "event_price", "internet_price", "normal_price"]
+
+# Datos crudos del scraper: los precios llegan como texto ("1,299.00").
+PRODUCT_DETAIL_DTYPES = {
+    "name": ARROW_STRING,
+    "product_code": ARROW_STRING,
+    **{col: "category" for col in CATEGORY_COLUMNS},
+    "reviews": "UInt32",
+    "rating": "float32",
+    "url_image": ARROW_STRING,
+    **{col: ARROW_STRING for col in PRICE_COLUMNS},
+    "url_product": ARROW_STRING,
+}
+
+PRODUCTS_LIST_DTYPES = {
+    "url": ARROW_STRING,
+    "rating": "float32",
+    "reviews": "UInt32",
+}
+
+# Datos transformados: precios numéricos y diferencia porcentual calculada.
+TRANSFORMED_DTYPES = {
+    **{col: dtype for col, dtype in PRODUCT_DETAIL_DTYPES.items()
+       if col not in PRICE_COLUMNS},
+    "internet_price": "float64",
+    "normal_price": "float64",
+    "price_diff_%": "float64",
+}
+
+CLARITY_FLAG_DTYPE = pd.CategoricalDtype(categories=["si", "no"])
+
+ENRICHMENT_DTYPES = {
+    **TRANSFORMED_DTYPES,
+    "relation_batch": "boolean",
+    "clarity_flag_batch": CLARITY_FLAG_DTYPE,
+    "suggested_description_batch": ARROW_STRING,
+}
+
+
+def apply_schema(df, schema):
+    """
+    Convierte las columnas del DataFrame a los tipos declarados en el esquema.
+
+    Las columnas que no estén en el DataFrame se ignoran.
+
+    Args:
+        df (pandas.DataFrame): DataFrame a convertir.
+        schema (dict): Mapeo columna -> dtype.
+
+    Returns:
+        pandas.DataFrame: DataFrame con los tipos aplicados.
+    """
+    return df.astype({col: dtype for col, dtype in schema.items() if col in df.columns})
+
+
+def read_csv_with_schema(csv_path, schema):
+    """
+    Lee un CSV aplicando los tipos declarados en el esquema durante la lectura.
+
+    Args:
+        csv_path (str): Ruta del archivo CSV.
+        schema (dict): Mapeo columna -> dtype.
+
+    Returns:
+        pandas.DataFrame: DataFrame con los tipos aplicados.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in schema.items() if col in header}
+    return pd.read_csv(csv_path, dtype=dtypes)
+
+
+def memory_report(df_before, df_after, group_by="family", repeat=5):
+    """
+    Compara memoria y latencia de agrupación entre dos versiones del mismo DataFrame.
+
+    Args:
+        df_before (pandas.DataFrame): DataFrame con los tipos por defecto de pandas.
+        df_after (pandas.DataFrame): DataFrame con el esquema aplicado.
+        group_by (str, opcional): Columna usada para medir la agrupación.
+        repeat (int, opcional): Repeticiones de la agrupación (se toma la mejor).
+
+    Returns:
+        pandas.DataFrame: Memoria (MB) y latencia (ms) antes y después, con la mejora.
+    """
+    def best_groupby_ms(df):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            df.groupby(group_by, observed=True).agg(
+                mean_reviews=("reviews", "mean"),
+                mean_rating=("rating", "mean"),
+                count_products=("name", "count"),
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
+
+    mb_before = df_before.memory_usage(deep=True).sum() / 1024 ** 2
+    mb_after = df_after.memory_usage(deep=True).sum() / 1024 ** 2
+    ms_before = best_groupby_ms(df_before)
+    ms_after = best_groupby_ms(df_after)
+    return pd.DataFrame({
+        "before": [mb_before, ms_before],
+        "after": [mb_after, ms_after],
+        "improvement_x": [mb_before / mb_after, ms_before / ms_after],
+    }, index=["memory_mb", f"groupby_{group_by}_ms"])
+
+
+if __name__ == "__main__":
+    SOURCE_CSV = "data/transformed/enrichment/enrichment_products.csv"
+    base = pd.read_csv(SOURCE_CSV)
+    for scale in (1, 100, 1000):
+        scaled = pd.concat([base] * scale, ignore_index=True)
+        typed = apply_schema(scaled, ENRICHMENT_DTYPES)
+        print(f"--- {len(scaled):,} filas ---")
+        print(memory_report(scaled, typed).round(2))
@@ -0,0 +1,192 @@
+"""
+Este módulo carga el dataset 'Data_DeportistasEventos.csv' del IPD aplicando el esquema
+declarado en 'docs/data_dictionary.md' durante la lectura.
+
+Reemplaza la limpieza de 'notebooks/data_cleaning.ipynb':
+
+1. Lectura:
+   - Solo se leen las columnas usadas ('usecols'); las de ubicación del IPD y 'COLECTIVO'
+     nunca se cargan.
+   - Tipos declarados: categóricos para 'FEDERACION', 'PAIS_EVENTO', 'CIUDAD_EVENTO',
+     'ESPECIALIDAD' y 'PUESTO'; enteros de 32 bits para 'ITEM' y enteros nullables
+     ('Int32') para las fechas, que pueden venir vacías.
+   - Lectura por bloques opcional ('chunksize') para archivos grandes.
+
+2. Transformación:
+   - Las fechas aaaammdd se convierten aritméticamente (año, mes y día por división entera)
+     sin pasar por texto.
+   - 'cant_medallas' se calcula sobre las categorías de 'PUESTO' y no fila por fila.
+
+3. Snapshot:
+   - Se guarda un Parquet en 'data/transformed/' que puede consumir la actualización de
+     Power BI.
+
+Uso:
+    python -m src.ingestion
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+RAW_FILE = os.path.join("data", "raw", "Data_DeportistasEventos.csv")
+SNAPSHOT_FILE = os.path.join("data", "transformed", "data_deportistas_peru.parquet")
+ENCODING = "latin-1"
+SEPARATOR = ";"
+
+DATE_COLUMNS = ["FECHA_CORTE", "FECHA_INICIO", "FECHA_FIN", "FECHA_PUBLICACION"]
+CATEGORY_COLUMNS = ["FEDERACION", "PAIS_EVENTO", "CIUDAD_EVENTO", "ESPECIALIDAD", "PUESTO"]
+MEDALS = ["ORO", "PLATA", "BRONCE"]
+# Años completos representables en datetime64[ns] (pd.Timestamp.min/max: 1677 a 2262).
+MIN_YEAR, MAX_YEAR = 1678, 2261
+
+DTYPES = {
+    "FECHA_CORTE": "Int32",
+    "ITEM": "int32",
+    "FEDERACION": "category",
+    "EVENTO": "string",
+    "PAIS_EVENTO": "category",
+    "CIUDAD_EVENTO": "category",
+    "FECHA_INICIO": "Int32",
+    "FECHA_FIN": "Int32",
+    "DEPORTISTA": "string",
+    "PUESTO": "category",
+    "ESPECIALIDAD": "category",
+    "FECHA_PUBLICACION": "Int32",
+}
+USECOLS = list(DTYPES)
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [
+        (col, pa.timestamp("ns")) if col in DATE_COLUMNS
+        else (col, pa.dictionary(pa.int32(), pa.string())) if col in CATEGORY_COLUMNS
+        else (col, pa.int32()) if col == "ITEM"
+        else (col, pa.string())
+        for col in USECOLS
+    ]
+    + [("cant_medallas", pa.int8())]
+)
+
+
+def parse_yyyymmdd(values):
+    """
+    Convierte enteros aaaammdd a fechas sin convertirlos a texto.
+
+    Los valores nulos, no positivos o con un mes o día inexistente (por ejemplo 20230231
+    o 20240100) se convierten en NaT en lugar de desplazarse a otra fecha. También los
+    años fuera de 'MIN_YEAR'-'MAX_YEAR', que desbordarían datetime64[ns]: el marcador
+    99991231 ("sin fecha de fin"), valores con dígitos de más como 202401011 o
+    incompletos como 101.
+
+    Args:
+        values (pandas.Series): Enteros con formato aaaammdd.
+
+    Returns:
+        pandas.Series: Fechas (datetime64[ns]).
+    """
+    raw = pd.to_numeric(values, errors="coerce")
+    ints = raw.fillna(0).to_numpy(dtype=np.int64)
+
+    years = ints // 10000 - 1970
+    months = ints // 100 % 100 - 1
+    days = ints % 100 - 1
+    month_start = years.astype("datetime64[Y]").astype("datetime64[M]") + months
+    dates = month_start.astype("datetime64[D]") + days
+    # Un día fuera del mes hace que la fecha caiga en otro mes.
+    valid = raw.notna().to_numpy() & (ints > 0) \
+        & (years >= MIN_YEAR - 1970) & (years <= MAX_YEAR - 1970) \
+        & (months >= 0) & (months <= 11) \
+        & (days >= 0) & (dates.astype("datetime64[M]") == month_start)
+    dates = dates.astype("datetime64[ns]")
+    dates[~valid] = np.datetime64("NaT")
+    return pd.Series(dates, index=values.index, name=values.name)
+
+
+def count_medals(puesto):
+    """
+    Marca con 1 las filas cuyo 'PUESTO' es una medalla (ORO, PLATA o BRONCE).
+
+    La comparación se hace una vez por categoría y luego se expande con los códigos,
+    en lugar de comparar cada fila.
+
+    Args:
+        puesto (pandas.Series): Columna categórica 'PUESTO'.
+
+    Returns:
+        pandas.Series: 1 si la fila tiene medalla, 0 en otro caso (int8).
+    """
+    puesto = puesto.astype("category")
+    is_medal = np.append(puesto.cat.categories.isin(MEDALS), False).astype(np.int8)
+    # Los códigos -1 (nulos) apuntan al último elemento, que es False.
+    return pd.Series(is_medal[puesto.cat.codes.to_numpy()], index=puesto.index,
+                     name="cant_medallas")
+
+
+def transform_athletes(df):
+    """
+    Aplica las conversiones de fechas y el conteo de medallas.
+
+    Args:
+        df (pandas.DataFrame): Datos leídos con 'DTYPES'.
+
+    Returns:
+        pandas.DataFrame: DataFrame con fechas convertidas y la columna 'cant_medallas'.
+    """
+    for col in DATE_COLUMNS:
+        df[col] = parse_yyyymmdd(df[col])
+    df["cant_medallas"] = count_medals(df["PUESTO"])
+    return df
+
+
+def read_athletes(file_path=RAW_FILE, chunksize=None):
+    """
+    Lee y transforma el dataset de deportistas.
+
+    Args:
+        file_path (str, opcional): Ruta del CSV original del IPD.
+        chunksize (int, opcional): Si se indica, devuelve un iterador de bloques
+                                   transformados en lugar de un único DataFrame.
+
+    Returns:
+        pandas.DataFrame o iterador de pandas.DataFrame: Datos transformados.
+    """
+    reader = pd.read_csv(file_path, encoding=ENCODING, sep=SEPARATOR, usecols=USECOLS,
+                         dtype=DTYPES, chunksize=chunksize)
+    if chunksize is None:
+        return transform_athletes(reader)
+    return (transform_athletes(chunk) for chunk in reader)
+
+
+def write_snapshot(file_path=RAW_FILE, snapshot_path=SNAPSHOT_FILE, chunksize=None):
+    """
+    Genera el snapshot Parquet para Power BI.
+
+    Con 'chunksize' cada bloque se escribe como un row group a medida que se lee, sin
+    cargar el archivo completo en memoria.
+
+    Args:
+        file_path (str, opcional): Ruta del CSV original del IPD.
+        snapshot_path (str, opcional): Ruta del Parquet de salida.
+        chunksize (int, opcional): Filas por bloque.
+
+    Returns:
+        str: Ruta del snapshot escrito.
+    """
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    chunks = read_athletes(file_path, chunksize)
+    if chunksize is None:
+        chunks = [chunks]
+
+    tmp_path = f"{snapshot_path}.tmp"
+    with pq.ParquetWriter(tmp_path, SNAPSHOT_SCHEMA) as writer:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk[SNAPSHOT_SCHEMA.names], preserve_index=False)
+            writer.write_table(table.cast(SNAPSHOT_SCHEMA))
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+if __name__ == "__main__":
+    print(f"Snapshot generado en: {write_snapshot()}")